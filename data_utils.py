@@ -1,17 +1,36 @@
+import math
+import numbers
+
+import numpy as np
 import torch
 
+from torch.utils.data import DataLoader, TensorDataset
 from sklearn.model_selection import train_test_split
 
-def get_optimizer(model, optimizer_type: str, lr):
-    if optimizer_type == "SGD":
-        return torch.optim.SGD(model.parameters(), lr=lr)
+_OPTIMIZERS = {
+    "SGD": torch.optim.SGD,
+    "Adam": torch.optim.Adam,
+    "AdamW": torch.optim.AdamW,
+}
+
+def get_optimizer(model, optimizer_type: str, lr, **kwargs):
+    """
+    Builds an optimizer over the model's parameters by name.
 
-    if optimizer_type == "Adam":
-        return torch.optim.Adam(model.parameters(), lr=lr)
+    Extra kwargs are forwarded to the optimizer. On CUDA, foreach=True or
+    fused=True batch the per-parameter updates into a handful of kernel launches,
+    which matters for models made of many small layers. Only parameters with
+    requires_grad are handed to the optimizer, each exactly once.
+    """
+    optimizer_cls = _OPTIMIZERS.get(optimizer_type)
+    if optimizer_cls is None:
+        raise ValueError(f"Unrecognized type={optimizer_type}")
 
-    raise ValueError(f"Unrecognized type={optimizer_type}")
+    # Deduplicate by identity so shared parameters never get optimizer state twice
+    params = list({id(p): p for p in model.parameters() if p.requires_grad}.values())
+    return optimizer_cls(params, lr=lr, **kwargs)
 
-def get_linear_data():
+def get_linear_data(device=None):
     # Create some data (same as notebook 01)
     weight = 0.7
     bias = 0.3
@@ -19,29 +38,124 @@ def get_linear_data():
     end = 1
     step = 0.01
 
-    # Create data
-    X_regression = torch.arange(start, end, step).unsqueeze(dim=1)
-    y_regression = weight * X_regression + bias # linear regression formula
-
-    # Check the data
-    print(len(X_regression))
-    X_regression[:5], y_regression[:5]
+    # Create data directly as float32 on the target device
+    X_regression = torch.arange(start, end, step, dtype=torch.float32, device=device).unsqueeze(dim=1)
+    y_regression = X_regression.mul(weight).add_(bias) # linear regression formula
 
     return X_regression, y_regression
 
-def split_to_tensor(X, y, test_size=0.2, random_state=None):
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state
-    )
+def split_to_tensor(X, y, test_size=0.2, random_state=None, on_device=False):
+    """
+    Splits X and y into train/test sets and returns them as float32 tensors.
+
+    By default the split is done with sklearn's train_test_split. With on_device=True,
+    tensor inputs are split in torch instead, so they never round-trip through numpy
+    and stay on their device (required for CUDA tensors). The torch split draws a
+    different permutation than sklearn, so the same random_state gives a different,
+    though still reproducible, split.
+
+    Returns:
+    tuple: (X_train, X_test, y_train, y_test)
+    """
+    if on_device:
+        if not (isinstance(X, torch.Tensor) and isinstance(y, torch.Tensor)):
+            raise ValueError("on_device=True requires X and y to be torch tensors")
+        X_train, X_test, y_train, y_test = _torch_train_test_split(
+            X, y, test_size=test_size, random_state=random_state
+        )
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state
+        )
 
     return (
-        torch.FloatTensor(X_train),
-        torch.FloatTensor(X_test),
-        torch.FloatTensor(y_train),
-        torch.FloatTensor(y_test)
+        _to_float_tensor(X_train),
+        _to_float_tensor(X_test),
+        _to_float_tensor(y_train),
+        _to_float_tensor(y_test)
+    )
+
+def _to_float_tensor(a):
+    if isinstance(a, torch.Tensor):
+        return a.to(torch.float32)
+
+    # from_numpy shares the buffer with zero copy when the array is already
+    # contiguous float32; that same buffer is what a pinned DataLoader pins
+    return torch.from_numpy(np.ascontiguousarray(a, dtype=np.float32))
+
+def _torch_train_test_split(X, y, test_size=0.2, random_state=None):
+    n = len(X)
+    if len(y) != n:
+        raise ValueError(f"X and y have inconsistent lengths: {n} and {len(y)}")
+    if y.device != X.device:
+        raise ValueError(f"X and y are on different devices: {X.device} and {y.device}")
+
+    # Same validation and rounding as sklearn: an int is an absolute count, a float a fraction
+    if test_size is None:
+        test_size = 0.25
+    if isinstance(test_size, numbers.Integral):
+        if not 0 < test_size < n:
+            raise ValueError(f"test_size={test_size} should be between 1 and {n - 1}")
+        n_test = int(test_size)
+    elif isinstance(test_size, numbers.Real):
+        if not 0 < test_size < 1:
+            raise ValueError(f"test_size={test_size} should be a float in the (0, 1) range")
+        n_test = math.ceil(test_size * n)
+    else:
+        raise ValueError(f"Invalid value for test_size: {test_size}")
+
+    if n_test >= n:
+        raise ValueError(f"test_size={test_size} with n_samples={n} leaves an empty train set")
+
+    generator = torch.Generator(device=X.device)
+    if random_state is None:
+        generator.seed()
+    elif isinstance(random_state, np.random.RandomState):
+        # Draw the seed from the caller's RandomState, advancing it as sklearn would
+        generator.manual_seed(int(random_state.randint(np.iinfo(np.int32).max)))
+    elif isinstance(random_state, numbers.Integral):
+        generator.manual_seed(int(random_state))
+    else:
+        raise ValueError(f"{random_state!r} cannot be used to seed a torch.Generator")
+
+    idx = torch.randperm(n, generator=generator, device=X.device)
+    train_idx, test_idx = idx[n_test:], idx[:n_test]
+    return X[train_idx], X[test_idx], y[train_idx], y[test_idx]
+
+def make_loaders(X_train, y_train, X_test, y_test, batch_size, num_workers=4, pin_memory=True):
+    """
+    Wraps train/test tensors in DataLoaders set up to overlap host->device copies with compute.
+
+    With pin_memory=True, move each batch with batch.to(device, non_blocking=True).
+    Calling batch.pin_memory().to(device) yourself is slower than a plain .to(device).
+    Tensors already on the GPU are loaded in-process without pinning, since CUDA
+    tensors cannot be pinned or used from forked workers.
+
+    Returns:
+    tuple: (train_loader, test_loader)
+    """
+    if any(t.is_cuda for t in (X_train, y_train, X_test, y_test)):
+        num_workers = 0
+        pin_memory = False
+
+    loader_kwargs = dict(
+        batch_size=batch_size,
+        num_workers=num_workers,
+        pin_memory=pin_memory,
+        persistent_workers=num_workers > 0,
+        # prefetch_factor is only accepted when loading with worker processes
+        prefetch_factor=2 if num_workers > 0 else None,
     )
 
+    train_loader = DataLoader(TensorDataset(X_train, y_train), shuffle=True, **loader_kwargs)
+    test_loader = DataLoader(TensorDataset(X_test, y_test), shuffle=False, **loader_kwargs)
+    return train_loader, test_loader
+
+@torch.no_grad()
 def accuracy_fn(y_true, y_pred):
-    correct = torch.eq(y_true, y_pred).sum().item() # torch.eq() calculates where two tensors are equal
-    acc = (correct / len(y_pred)) * 100
-    return acc
+    # Stays on-device as a 0-dim tensor; call .item() only when logging
+    if y_true.shape != y_pred.shape:
+        raise ValueError(f"Shape mismatch: y_true {tuple(y_true.shape)} vs y_pred {tuple(y_pred.shape)}")
+
+    correct = torch.count_nonzero(torch.eq(y_true, y_pred)) # torch.eq() calculates where two tensors are equal
+    return correct.mul(100.0 / y_pred.numel())
@@ -1,36 +1,88 @@
+import copy
+import functools
 import json
 import os
 from google.colab import drive
 
-def setup_environment_from_json(json_path):
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
+
+_DRIVE_MOUNTED = False
+
+def _ensure_drive_mounted():
+    """
+    Mounts Google Drive once per session; later calls skip the Colab mount round-trip.
+    """
+    global _DRIVE_MOUNTED
+    if not _DRIVE_MOUNTED:
+        drive.mount('/content/drive', force_remount=False)
+        _DRIVE_MOUNTED = True
+
+def _load_json(path):
+    """
+    Parses a JSON file, caching the result so repeated reads of the same config are free.
+    The file's modification time is part of the cache key, so edits are picked up.
+    """
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path, mtime_ns):
+    """
+    Parses with orjson when installed, falling back to the stdlib parser for anything
+    orjson rejects (e.g. NaN/Infinity or integers beyond 64 bits), so the accepted
+    grammar matches json. Note that some older orjson releases turn integers beyond
+    64 bits into floats instead of rejecting them; use integers that fit in 64 bits
+    (or strings) for such values.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+
+    return json.loads(data.decode('utf-8'))
+
+def setup_environment_from_json(json_path, verbose=False):
     """
     Reads a JSON file containing key-value pairs and sets them as environment variables.
     
     Parameters:
     json_path (str): Path to the JSON file in Google Drive
+    verbose (bool): Print each environment variable name as it is set
     
     Returns:
     dict: Dictionary of successfully set environment variables
     """
     # First, mount Google Drive if not already mounted
-    drive.mount('/content/drive', force_remount=False)
+    _ensure_drive_mounted()
     
     try:
-        # Read the JSON file
-        with open(json_path, 'r', encoding='utf-8') as file:
-            config = json.load(file)
+        # Read the JSON file (cached per path)
+        config = _load_json(json_path)
             
         # Validate that we have a dictionary
         if not isinstance(config, dict):
             raise ValueError("JSON file must contain a key-value object")
             
-        # Set each key-value pair as an environment variable
-        for key, value in config.items():
-            # Convert value to string since environment variables must be strings
-            os.environ[str(key)] = str(value)
-            print(f"Set environment variable: {key}")
+        # Convert to strings since environment variables must be strings,
+        # skipping the conversion for entries that already are
+        cleaned = {
+            (key if isinstance(key, str) else str(key)): (value if isinstance(value, str) else str(value))
+            for key, value in config.items()
+        }
+        os.environ.update(cleaned)
+
+        if verbose:
+            for key in cleaned:
+                print(f"Set environment variable: {key}")
             
-        return config
+        # Deep copy so callers can't mutate the cached config, including nested values
+        return copy.deepcopy(config)
         
     except FileNotFoundError:
         print(f"Error: Could not find config file at {json_path}")
@@ -1,16 +1,20 @@
-from dataclasses import asdict
-from typing import List, Optional, Union, Callable
+import copy
+import itertools
+import warnings
+from typing import List, NamedTuple, Optional, Union, Callable
 from enum import Enum
 import torch
 import torch.nn as nn
-from functools import reduce
 
 class LayerType(Enum):
     """Enumeration of supported neural network layer types."""
     LINEAR = "linear"
 
-@dataclasses.dataclass
-class LayerSpecs:
+_LAYER_CLASSES = {
+    LayerType.LINEAR: nn.Linear,
+}
+
+class LayerSpecs(NamedTuple):
     """Specifications for a neural network layer.
 
     Attributes:
@@ -28,16 +32,39 @@ class GenericNeuralNetworkModel(nn.Module):
     easily extended to support more complex architectures.
 
     Attributes:
-        layers (nn.ModuleList): List of neural network layers
-        activation_fn (Optional[nn.Module]): Activation function to be applied between layers
+        net (nn.Sequential): Layers interleaved with copies of the activation function
         
     Args:
         specs (List[LayerSpecs]): List of layer specifications defining the network architecture.
             Each spec should contain the input and output dimensions for each layer.
         activation_fn (Optional[nn.Module]): Activation function to use between layers.
-            If None, no activation function is applied. Default: None
+            If None, no activation function is applied. Each position gets its own
+            deep copy, so stateful activations (e.g. nn.PReLU) are not shared. Default: None
         layer_type (LayerType): Type of layers to use in the network.
             Currently supports LINEAR layers only. Default: LayerType.LINEAR
+        compile_model (bool): If True, compiles the module in place with
+            nn.Module.compile so the layers and activations can be fused into fewer
+            kernels. The first call pays a one-off compilation (warmup) cost.
+            Default: False
+        compile_mode (str): Mode passed to torch.compile. Compilation uses
+            dynamic=False since the layer specs fix the shapes at construction.
+            Default: "reduce-overhead"
+        scripted (bool): If True, compiles the layer stack with torch.jit.script to
+            avoid per-layer Python dispatch. TorchScript optimizes on the first calls,
+            so run the model once on a dummy input of the expected shape during setup
+            to pay that cost up front. Default: False
+        enable_cuda_graph (bool): If True, forward captures the layer stack into a CUDA
+            graph and replays it for inputs matching example_input's shape, device and
+            dtype when autograd is disabled (e.g. under torch.inference_mode). This
+            removes per-kernel launch overhead, which dominates small MLPs. Capture
+            happens lazily on the first such call, so move the model to
+            example_input's device and load its weights first. The graph is
+            re-captured if the parameter storage is later reallocated (e.g. by
+            .half() or load_state_dict(assign=True)). Other no-grad inputs fall back
+            to the regular path with a warning. Cannot be combined with compile_model,
+            whose "reduce-overhead" mode already uses CUDA graphs. Default: False
+        example_input (Optional[torch.Tensor]): CUDA tensor with the fixed input
+            shape, required when enable_cuda_graph is True. Default: None
 
     Example:
         >>> model = GenericNeuralNetworkModel(
@@ -50,24 +77,52 @@ class GenericNeuralNetworkModel(nn.Module):
         ... )
     
     Raises:
-        ValueError: If an unsupported layer type is specified
+        ValueError: If an unsupported layer type is specified, or if enable_cuda_graph
+            is set without a CUDA example_input or together with compile_model
     """
     
     def __init__(
         self, 
         specs: List[LayerSpecs], 
         activation_fn: Optional[nn.Module] = None,
-        layer_type: LayerType = LayerType.LINEAR
+        layer_type: LayerType = LayerType.LINEAR,
+        compile_model: bool = False,
+        compile_mode: str = "reduce-overhead",
+        scripted: bool = False,
+        enable_cuda_graph: bool = False,
+        example_input: Optional[torch.Tensor] = None
     ):
         super().__init__()
-        self.layers = self._generate_layers(specs, layer_type)
-        self.activation_fn = activation_fn
+        self._graph = None
+        self._graph_spec = None
+        self.net = self._generate_layers(specs, activation_fn, layer_type)
+        # Empty buffer that follows the model across .to() calls, used to report its device
+        self.register_buffer("_dev", torch.empty(0), persistent=False)
+
+        if scripted:
+            # script rather than trace: tracing silently drops control flow
+            self.net = torch.jit.script(self.net)
+
+        if enable_cuda_graph:
+            if example_input is None or not example_input.is_cuda:
+                raise ValueError("a CUDA example_input is required when enable_cuda_graph=True")
+            if compile_model:
+                raise ValueError("enable_cuda_graph and compile_model cannot be combined")
+            # Captured on the first eligible forward, once weights and device are final
+            self._graph_spec = (example_input.shape, example_input.device, example_input.dtype)
+            # load_state_dict(assign=True) swaps in new parameter tensors
+            self.register_load_state_dict_post_hook(self._on_load_state_dict)
+
+        if compile_model:
+            # nn.Module.compile keeps forward a regular method, so the model still
+            # pickles and deepcopies (e.g. target/EMA copies) use their own weights
+            self.compile(mode=compile_mode, dynamic=False)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """Forward pass through the network.
         
-        Applies each layer sequentially, with activation functions between layers
-        except for the final layer.
+        Runs the prebuilt nn.Sequential, which applies each layer in order with
+        activation functions between layers except after the final layer.
         
         Args:
             x (torch.Tensor): Input tensor with shape matching the first layer's
@@ -77,51 +132,146 @@ class GenericNeuralNetworkModel(nn.Module):
             torch.Tensor: Output tensor with shape matching the final layer's
                 output dimensions
         """
-        return compose(
-            *([zip(layer, self.activation_fn) for layer in self.layers][:-1])
-        )
+        if self._graph_spec is not None and not torch.is_grad_enabled():
+            if (x.shape, x.device, x.dtype) == self._graph_spec and self.device == x.device:
+                if self._graph is None:
+                    self._capture_cuda_graph(x)
+                self._static_in.copy_(x)
+                self._graph.replay()
+                # replay overwrites the static output, so hand out a copy
+                return self._static_out.clone()
+
+            warnings.warn(
+                "CUDA graph replay skipped: input or model does not match the captured "
+                f"shape/device/dtype {self._graph_spec}; running the regular forward"
+            )
+
+        return self.net(x)
+
+    @property
+    def device(self) -> torch.device:
+        """torch.device: Device the model's parameters and buffers live on."""
+        return self._dev.device
+
+    def forward_batched(self, x: torch.Tensor) -> torch.Tensor:
+        """Forward pass that first moves the input to the model's device if needed.
+
+        When the model is on CUDA the copy is issued with non_blocking=True, so it
+        only overlaps with compute when the batch is already in pinned memory. Let
+        the DataLoader pin it rather than pinning per batch yourself.
+
+        Args:
+            x (torch.Tensor): Input tensor on any device
+
+        Returns:
+            torch.Tensor: Output tensor on the model's device
+
+        Example:
+            >>> loader = DataLoader(dataset, batch_size=64, pin_memory=True)
+            >>> for batch, _ in loader:
+            ...     out = model.forward_batched(batch)  # batch.to(device, non_blocking=True)
+            >>> # Slower: batch.pin_memory().to(device, non_blocking=True)
+        """
+        if x.device != self.device:
+            # Async only for host->device; a device->host copy would race the CPU layers
+            x = x.to(self.device, non_blocking=self.device.type == "cuda")
+        return self(x)
+
+    def _apply(self, fn, *args, **kwargs):
+        module = super()._apply(fn, *args, **kwargs)
+        self._invalidate_stale_cuda_graph()
+        return module
+
+    def _on_load_state_dict(self, module, incompatible_keys) -> None:
+        self._invalidate_stale_cuda_graph()
+
+    def _storage_ptrs(self) -> tuple:
+        return tuple(t.data_ptr() for t in itertools.chain(self.net.parameters(), self.net.buffers()))
+
+    def _invalidate_stale_cuda_graph(self) -> None:
+        """Drops the captured CUDA graph if the parameter storage it reads has moved.
+
+        The next eligible forward then re-captures against the new storage.
+        """
+        if self._graph is not None and self._storage_ptrs() != self._graph_ptrs:
+            self._graph = None
+            self._static_in = None
+            self._static_out = None
+
+    def _capture_cuda_graph(self, example_input: torch.Tensor) -> None:
+        """Captures an inference pass of the layer stack into a CUDA graph.
+
+        Args:
+            example_input (torch.Tensor): CUDA tensor on the model's device whose
+                shape and dtype the captured graph is specialized to
+        """
+        # Static tensors must be normal tensors even when capture is triggered
+        # under inference_mode, so later no_grad calls can still copy_ into them
+        with torch.inference_mode(False), torch.no_grad():
+            self._static_in = example_input.clone()
+
+            # Warm up on a side stream before capturing, as torch.cuda.graph requires
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self.net(self._static_in)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            self._graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self._graph):
+                self._static_out = self.net(self._static_in)
+
+        self._graph_ptrs = self._storage_ptrs()
 
     def _generate_layers(
         self, 
         specs: List[LayerSpecs], 
+        activation_fn: Optional[nn.Module],
         layer_type: LayerType
-    ) -> nn.ModuleList:
+    ) -> nn.Sequential:
         """Generates neural network layers based on specifications.
         
         Args:
             specs (List[LayerSpecs]): List of layer specifications
+            activation_fn (Optional[nn.Module]): Activation function to insert
+                between consecutive layers
             layer_type (LayerType): Type of layers to generate
 
         Returns:
-            nn.ModuleList: List of generated neural network layers
+            nn.Sequential: Generated layers interleaved with activation functions
 
         Raises:
             ValueError: If layer_type is not supported
         """
-        layers = []
-        for i, spec in enumerate(specs):
-            layer = None
+        layer_cls = _LAYER_CLASSES.get(layer_type)
+        if layer_cls is None:
+            raise ValueError(f"Unknown or unsupported layer type: {layer_type}")
 
-            if layer_type == LayerType.LINEAR:
-                layer = nn.Linear(**asdict(spec))
-            else:
-                raise ValueError(f"Unknown or unsupported layer type: {layer_type}")
+        modules = []
+        for i, spec in enumerate(specs):
+            modules.append(layer_cls(spec.in_features, spec.out_features))
 
-            setattr(self, f"layer_{i}", layer)
-            layers.append(layer)
+            if activation_fn is not None and i < len(specs) - 1:
+                modules.append(copy.deepcopy(activation_fn))
             
-        return nn.ModuleList(layers)
+        return nn.Sequential(*modules)
 
-def compose(*functions: List[Callable]) -> Callable:
+def compose(*functions: Callable) -> Callable:
     """Composes multiple functions into a single function.
     
     Args:
-        *functions: Variable number of function pairs (layer, activation)
+        *functions: Variable number of callables, applied left to right
         
     Returns:
         Callable: Composed function that applies all functions in sequence
     """
-    return reduce(lambda f, g: lambda x: g(f(x)), functions)
+    def composed(x):
+        for fn in functions:
+            x = fn(x)
+        return x
+
+    return composed
 
 # Example usage
 if __name__ == "__main__":
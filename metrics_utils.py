@@ -1,25 +1,49 @@
+import torch
+
+# The accuracy functions return a 0-dim tensor on the inputs' device so that no
+# device->host sync happens per batch; call .item() only when logging.
+
 # For simple accuracy
+@torch.no_grad()
 def simple_accuracy_fn(y_true, y_pred):
-    correct = torch.eq(y_true, y_pred).sum().item()
-    acc = (correct / len(y_pred)) * 100
-    return acc
+    # A broadcast (N, 1) vs (N,) comparison would count N*N pairs, so reject it
+    if y_true.shape != y_pred.shape:
+        raise ValueError(f"Shape mismatch: y_true {tuple(y_true.shape)} vs y_pred {tuple(y_pred.shape)}")
+
+    # count_nonzero reduces the mask directly, without a float cast; numel() rather
+    # than len() so multi-dim predictions are counted in full
+    correct = torch.count_nonzero(torch.eq(y_true, y_pred))
+    return correct.mul(100.0 / y_pred.numel())
+
+# argmax, comparison and mean compiled into one fused reduction so the
+# predictions and the equality mask are never materialized. Default mode rather
+# than "reduce-overhead": CUDA graphs would hand back the same static output
+# buffer every call, clobbering accuracies callers keep across batches
+@torch.compile(fullgraph=True)
+def _fused_multiclass_acc(y_true, logits):
+    return (logits.argmax(dim=1) == y_true).float().mean() * 100
 
 # For multiclass accuracy
+@torch.no_grad()
 def multiclass_accuracy_fn(y_true, logits):
-    y_pred = torch.argmax(logits, dim=1)
-    return (y_true == y_pred).float().mean().item() * 100
+    return _fused_multiclass_acc(y_true, logits)
 
 # For pipeline with softmax
+@torch.no_grad()
 def pipeline_with_softmax_accuracy_fn(y_true, logits):
-    y_pred = torch.softmax(logits, dim=1).argmax(dim=1)
-    return (y_true == y_pred).float().mean().item() * 100
+    # softmax is monotonic, so argmax(softmax(logits)) == argmax(logits)
+    y_pred = logits.argmax(dim=1)
+    return (y_true == y_pred).to(torch.float32).mean().mul_(100)
 
 # device handling and dtype checking
+@torch.no_grad()
 def device_and_dtype_accuracy_fn(y_true, y_pred):
-    # Move to same device and type
-    y_true = y_true.to(y_pred.device)
-    y_true = y_true.long()
+    # Move to same device and type, only when they differ
+    if y_true.device != y_pred.device:
+        # Only host->device copies are safe to leave async; a device->host copy
+        # would race the CPU comparison below
+        y_true = y_true.to(y_pred.device, non_blocking=y_pred.device.type == "cuda")
+    if y_true.dtype != torch.long:
+        y_true = y_true.long()
     
-    correct = (y_true == y_pred).float().sum()
-    acc = correct / len(y_true) * 100
-    return acc.item()
+    return (y_true == y_pred).to(torch.float32).mean().mul_(100)